@@ -3,25 +3,73 @@ import argparse
 import sys
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from typing import List
+from typing import Iterator
 
+try:
+    # libxml2-backed parser; much faster on large exports and can filter by tag natively
+    from lxml import etree as lxml_etree
+except ImportError:
+    lxml_etree = None
 
-def parse_enex_titles(enex_path: Path) -> List[str]:
+NOTE_TAG = "note"
+
+# Bytes of encoded titles buffered before a single write when printing
+PRINT_BUFFER_BYTES = 64 * 1024
+
+
+def parse_enex_titles(enex_path: Path) -> Iterator[str]:
     """
-    Parse an Evernote .enex export and return a list of note titles.
+    Parse an Evernote .enex export and yield note titles in export order.
     Uses streaming XML parsing to handle large exports.
+    Prefers lxml when installed, otherwise falls back to xml.etree.ElementTree.
     """
-    titles: List[str] = []
+    if lxml_etree is not None:
+        yield from _parse_enex_titles_lxml(enex_path)
+        return
+
+    # ElementTree is C-accelerated on Python 3 but can't filter by tag, so bail out
+    # early on the <content>/<resource>/<data> elements that dominate an export
+    context = iter(ET.iterparse(str(enex_path), events=("start", "end")))
+    first = next(context, None)  # first event is the start of <en-export>
+    if first is None:
+        return
+    _, root = first
+
+    for event, elem in context:
+        if event != "end" or elem.tag != NOTE_TAG:
+            continue
+        yield (elem.findtext("title") or "").strip()
+        elem.clear()  # free memory
+        del root[:]  # otherwise the root keeps every (empty) note it has ever seen
+
 
-    context = ET.iterparse(str(enex_path), events=("end",))
+def _parse_enex_titles_lxml(enex_path: Path) -> Iterator[str]:
+    # tag="note" keeps every other element's events on the C side. huge_tree lifts
+    # libxml2's size limits for large exports, so entity expansion and network
+    # access are switched off to keep the parser safe against entity bombs
+    context = lxml_etree.iterparse(
+        str(enex_path),
+        events=("end",),
+        tag=NOTE_TAG,
+        huge_tree=True,
+        resolve_entities=False,
+        no_network=True,
+    )
     for _, elem in context:
-        if elem.tag == "note":
-            title_elem = elem.find("title")
-            title = (title_elem.text or "").strip() if title_elem is not None else ""
-            titles.append(title)
-            elem.clear()  # free memory
+        yield (elem.findtext("title") or "").strip()
+        # free memory: the note itself plus already-processed siblings held by the root
+        elem.clear()
+        while elem.getprevious() is not None:
+            del elem.getparent()[0]
+
 
-    return titles
+def _write_encoded(data: bytearray, encoding: str, errors: str) -> None:
+    # Text-only stdout replacements (IDE consoles, capture wrappers) have no .buffer
+    out = getattr(sys.stdout, "buffer", None)
+    if out is None:
+        sys.stdout.write(data.decode(encoding, errors))
+    else:
+        out.write(data)
 
 
 def main() -> None:
@@ -42,20 +90,37 @@ def main() -> None:
         print(f"ERROR: File not found: {enex_path}", file=sys.stderr)
         sys.exit(2)
 
-    titles = parse_enex_titles(enex_path)
-
     print(f"ENEX file: {enex_path}")
-    print(f"Total exported notes: {len(titles)}")
-
-    empty_titles = [i for i, t in enumerate(titles, start=1) if not t]
-    print(f"Empty titles: {len(empty_titles)}")
 
+    # Single pass over the export: count as we go and stream titles out as encoded
+    # bytes, so only the output buffer is retained rather than one str per line
+    total = 0
+    empty_titles = 0
+    encoding = getattr(sys.stdout, "encoding", None) or "utf-8"
+    errors = getattr(sys.stdout, "errors", None) or "strict"
+    buf = bytearray()
+    if args.print:
+        sys.stdout.flush()  # keep the header ahead of the raw buffer writes
+    for title in parse_enex_titles(enex_path):
+        total += 1
+        if not title:
+            empty_titles += 1
+        if args.print:
+            buf += title.encode(encoding, errors)
+            buf += b"\n"
+            if len(buf) >= PRINT_BUFFER_BYTES:
+                _write_encoded(buf, encoding, errors)
+                buf.clear()
     if args.print:
-        for t in titles:
-            print(t)
+        if buf:
+            _write_encoded(buf, encoding, errors)
+        sys.stdout.flush()
+
+    print(f"Total exported notes: {total}")
+    print(f"Empty titles: {empty_titles}")
 
     if args.fail_on_empty_title and empty_titles:
-        print(f"ERROR: Found {len(empty_titles)} notes with empty titles.", file=sys.stderr)
+        print(f"ERROR: Found {empty_titles} notes with empty titles.", file=sys.stderr)
         sys.exit(1)
 
 
@@ -0,0 +1,260 @@
+"""Shared helpers for the Notion scripts.
+
+Holds the API constants, environment lookup, title extraction helpers, the shared
+HTTP client and the search pagination loop used by both notion_all_shared.py and
+notion_list_records.py.
+
+The scripts are run as files (python app/notion_list_records.py), which puts app/
+first on sys.path, so they import this module by its bare name.
+"""
+import os
+import sys
+import json
+import asyncio
+import functools
+import importlib.util
+from typing import Any, Dict, Iterable, Iterator, List, Optional, cast
+
+import httpx
+
+try:
+    # Rust-backed JSON codec; noticeably faster on large paginated responses
+    import orjson
+except ImportError:
+    orjson = None
+
+NOTION_VERSION = "2025-09-03"
+NOTION_API_BASE = "https://api.notion.com/v1"
+PAGE_SIZE = 100  # Notion's maximum for search and query endpoints
+
+# Number of output lines buffered before a single write to stdout
+PRINT_BATCH_SIZE = 1024
+
+# httpx only speaks HTTP/2 when the optional h2 package is installed
+HTTP2_AVAILABLE = importlib.util.find_spec("h2") is not None
+
+# Cap on in-flight requests for concurrent fetches; Notion rate-limits per integration
+MAX_CONCURRENT_REQUESTS = 10
+
+# How many times a rate-limited (HTTP 429) request is retried, and the wait used
+# when the response carries no usable Retry-After header
+MAX_RATE_LIMIT_RETRIES = 5
+DEFAULT_RETRY_AFTER_SECONDS = 1.0
+
+
+def json_loads(data: bytes) -> Any:
+    """Decode a JSON response body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def json_dumps(obj: Any) -> bytes:
+    """Encode a JSON request body, using orjson when installed."""
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj).encode("utf-8")
+
+
+def require_env(name: str) -> str:
+    """Require an environment variable to be set.
+
+    Args:
+        name: The name of the environment variable to retrieve.
+
+    Returns:
+        The value of the environment variable.
+
+    Raises:
+        RuntimeError: If the environment variable is not set.
+    """
+    val = os.environ.get(name)
+    if not val:
+        raise RuntimeError(f"Missing env var: {name}")
+    return val
+
+
+def _rt_to_text(rt) -> str:
+    if not rt or not isinstance(rt, list):
+        return ""
+    # Most titles are a single rich-text run; skip the generator + join for those
+    if len(rt) == 1:
+        s = rt[0].get("plain_text", "")
+        return s.strip() if s else ""
+    return "".join(x["plain_text"] for x in rt if "plain_text" in x).strip()
+
+
+def _ds_title_from_obj(obj: dict) -> str:
+    # Common shapes we see
+    t = _rt_to_text(obj.get("title"))
+    if t:
+        return t
+    name = obj.get("name")
+    if isinstance(name, str) and name.strip():
+        return name.strip()
+    return ""
+
+
+@functools.lru_cache(maxsize=None)
+def _http_client(token: str) -> httpx.Client:
+    """
+    Shared keep-alive client per token, so repeated lookups reuse one TCP/TLS connection.
+    """
+    return httpx.Client(
+        base_url=NOTION_API_BASE,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        },
+        http2=HTTP2_AVAILABLE,
+        timeout=30.0,
+    )
+
+
+def _async_client(token: str) -> httpx.AsyncClient:
+    return httpx.AsyncClient(
+        base_url=NOTION_API_BASE,
+        headers={
+            "Authorization": f"Bearer {token}",
+            "Notion-Version": NOTION_VERSION,
+            "Content-Type": "application/json",
+        },
+        http2=HTTP2_AVAILABLE,
+        limits=httpx.Limits(max_connections=20),
+        timeout=30.0,
+    )
+
+
+def retrieve_data_source_by_id(token: str, data_source_id: str) -> dict:
+    """
+    Fetch a single data source object by id; raises httpx.HTTPStatusError on failure.
+    """
+    r = _http_client(token).get(f"/data_sources/{data_source_id}")
+    r.raise_for_status()
+    return json_loads(r.content)
+
+
+def _retry_after_seconds(r: httpx.Response) -> float:
+    try:
+        return max(float(r.headers.get("Retry-After", "")), 0.0)
+    except ValueError:
+        return DEFAULT_RETRY_AFTER_SECONDS
+
+
+async def get_with_retry_async(
+    client: httpx.AsyncClient, url: str, params: Optional[Dict[str, Any]] = None
+) -> httpx.Response:
+    """
+    GET url, sleeping for Retry-After and trying again while Notion answers 429.
+    The last response is returned as-is once MAX_RATE_LIMIT_RETRIES is used up.
+    """
+    r = await client.get(url, params=params)
+    for _ in range(MAX_RATE_LIMIT_RETRIES):
+        if r.status_code != 429:
+            break
+        await asyncio.sleep(_retry_after_seconds(r))
+        r = await client.get(url, params=params)
+    return r
+
+
+def ids_missing_titles(items: Iterable[Dict[str, Any]]) -> List[str]:
+    """
+    Ids of the data source search results that carried no usable title.
+    """
+    return [item["id"] for item in items if item.get("id") and not _ds_title_from_obj(item)]
+
+
+async def fetch_missing_data_source_titles_async(client: httpx.AsyncClient, missing: List[str]) -> Dict[str, str]:
+    """
+    Retrieve the data sources in missing (see ids_missing_titles) concurrently.
+    Returns {data_source_id: title}; lookups that fail or still have no title are left out,
+    so callers fall back to "(no title returned)" for them.
+    """
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async def fetch(ds_id: str) -> str:
+        try:
+            async with semaphore:
+                r = await get_with_retry_async(client, f"/data_sources/{ds_id}")
+        except httpx.HTTPError:
+            return ""  # one bad lookup shouldn't abort the whole listing
+        if r.is_error:
+            return ""
+        return _ds_title_from_obj(json_loads(r.content))
+
+    titles = await asyncio.gather(*(fetch(ds_id) for ds_id in missing))
+    return {ds_id: title for ds_id, title in zip(missing, titles) if title}
+
+
+def fetch_missing_data_source_titles(token: str, items: List[Dict[str, Any]]) -> Dict[str, str]:
+    """
+    Synchronous wrapper around fetch_missing_data_source_titles_async with its own client.
+    Returns {data_source_id: title} for the items search returned without a title.
+    """
+    missing = ids_missing_titles(items)
+    if not missing:
+        return {}  # nothing to look up, skip the event loop entirely
+
+    async def run() -> Dict[str, str]:
+        async with _async_client(token) as client:
+            return await fetch_missing_data_source_titles_async(client, missing)
+
+    return asyncio.run(run())
+
+
+def paginate(
+    token: str,
+    path: str,
+    payload: Dict[str, Any],
+    params: Optional[Dict[str, Any]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    POST payload to path on the shared client and yield every result, following
+    Notion's cursor pagination. Only one API page of results is held at a time.
+
+    Pages are fetched strictly one after another: Notion's cursors are opaque and only
+    arrive with the previous response, so there is nothing to prefetch or fan out.
+    Concurrency is applied across independent requests instead.
+    """
+    client = _http_client(token)
+    payload = dict(payload)  # start_cursor is added per page; leave the caller's dict alone
+
+    while True:
+        r = client.post(path, params=params, content=json_dumps(payload))
+        r.raise_for_status()
+        resp = cast(Dict[str, Any], json_loads(r.content))
+
+        yield from cast(List[Dict[str, Any]], resp.get("results", []))
+
+        # next_cursor is null exactly when has_more is false
+        cursor = cast(Optional[str], resp.get("next_cursor"))
+        if not cursor:
+            break
+        payload["start_cursor"] = cursor
+
+
+def iter_search(token: str, page_size: int = PAGE_SIZE, **body: Any) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every search result, following Notion's cursor pagination.
+    Extra keyword arguments (query, filter, sort) go straight into the request body.
+    """
+    return paginate(token, "/search", {"page_size": page_size, **body})
+
+
+def write_lines(lines: Iterable[str]) -> int:
+    """
+    Write lines to stdout in batches of PRINT_BATCH_SIZE, one write call per batch.
+    Returns the number of lines written.
+    """
+    batch: List[str] = []
+    count = 0
+    for line in lines:
+        batch.append(line)
+        count += 1
+        if len(batch) >= PRINT_BATCH_SIZE:
+            sys.stdout.write("\n".join(batch) + "\n")
+            batch.clear()
+    if batch:
+        sys.stdout.write("\n".join(batch) + "\n")
+    return count
@@ -6,37 +6,95 @@ and extract the titles of all records (rows) within them.
 import os
 import re
 import sys
+import time
+import hashlib
 import argparse
+import asyncio
+import functools
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, cast
+
 import httpx
-import httpx
-from typing import Any, Dict, List, Optional, cast
-from notion_client import Client as NotionClient
 
-NOTION_VERSION = "2025-09-03"
+from notion_common import (
+    MAX_CONCURRENT_REQUESTS,
+    PAGE_SIZE,
+    _async_client,
+    _ds_title_from_obj,
+    _http_client,
+    _rt_to_text,
+    fetch_missing_data_source_titles,
+    fetch_missing_data_source_titles_async,
+    get_with_retry_async,
+    ids_missing_titles,
+    iter_search,
+    json_dumps,
+    json_loads,
+    paginate,
+    require_env,
+    retrieve_data_source_by_id,
+    write_lines,
+)
+
+# name -> data_source_id lookups survive between runs for a day
+DS_ID_CACHE_PATH = Path.home() / ".cache" / "evernote-notion-compare" / "db_id_cache.json"
+DS_ID_CACHE_TTL_SECONDS = 24 * 60 * 60
+
+# A title property's id is always "title", so pages can be trimmed to it without a schema lookup
+TITLE_PROPERTY_ID = "title"
+TITLE_ONLY_PARAMS = {"filter_properties": [TITLE_PROPERTY_ID]}
+
+# Deletes every Latin-1 character that isn't a lowercase hex digit (incl dashes)
+_HEX_DIGITS = "0123456789abcdef"
+_NON_HEX_DELETE = str.maketrans("", "", "".join(chr(c) for c in range(256) if chr(c) not in _HEX_DIGITS))
+_NON_HEX_RE = re.compile(r"[^0-9a-f]")
+_DASHED_UUID_CHARS = frozenset(_HEX_DIGITS + "-")
+# Exactly a UUID: 32 hex digits, bare or in the canonical 8-4-4-4-12 dashed form
+_STRICT_UUID_RE = re.compile(r"[0-9a-f]{32}|[0-9a-f]{8}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{4}-[0-9a-f]{12}", re.IGNORECASE)
+
+def _hex_only(raw: str) -> str:
+    s = raw.strip().lower().translate(_NON_HEX_DELETE)
+    if not s.isascii():
+        # the translate table only covers Latin-1; let the regex catch anything wider
+        s = _NON_HEX_RE.sub("", s)
+    return s
 
 def normalize_uuid(raw: str) -> str:
     """
     Accepts UUID with or without dashes, returns dashed UUID.
     """
     s = raw.strip().lower()
-    s = re.sub(r"[^0-9a-f]", "", s)  # remove non-hex (incl dashes)
+    # fast path: already a dashed UUID
+    if (
+        len(s) == 36
+        and s[8] == s[13] == s[18] == s[23] == "-"
+        and s.count("-") == 4
+        and _DASHED_UUID_CHARS.issuperset(s)
+    ):
+        return s
+    s = _hex_only(s)
     if len(s) != 32:
         raise ValueError(f"Not a valid Notion UUID (need 32 hex chars): {raw}")
     return f"{s[0:8]}-{s[8:12]}-{s[12:16]}-{s[16:20]}-{s[20:32]}"
 
 def notion_url_from_uuid(raw: str) -> str:
-    s = re.sub(r"[^0-9a-f]", "", raw.strip().lower())
+    s = _hex_only(raw)
     if len(s) != 32:
         raise ValueError(f"Not a valid Notion UUID (need 32 hex chars): {raw}")
     return f"https://www.notion.so/{s}"
 
-def _rt_to_text(rt) -> str:
-    if isinstance(rt, list):
-        return "".join(x.get("plain_text", "") for x in rt).strip()
-    return ""
-
-def extract_page_title(page: dict) -> str:
+def extract_page_title(page: dict, title_key: Optional[str] = None) -> str:
+    """
+    Title of a page object, from a retrieve call, a search result or a data source query.
+    If title_key (the title property's key) is already known, that property is read
+    directly instead of scanning every property; this avoids assuming the title
+    property is literally named "Name".
+    """
     props = page.get("properties", {}) or {}
+    if title_key is not None:
+        prop = props.get(title_key)
+        if prop is not None:
+            return _rt_to_text(prop.get("title"))
     for prop in props.values():
         if prop.get("type") == "title":
             return _rt_to_text(prop.get("title"))
@@ -45,75 +103,10 @@ def extract_page_title(page: dict) -> str:
     return t
 
 def retrieve_page_by_id(token: str, page_id: str) -> dict:
-    url = f"https://api.notion.com/v1/pages/{page_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Notion-Version": NOTION_VERSION,
-    }
-    with httpx.Client(timeout=30.0) as client:
-        r = client.get(url, headers=headers)
-        r.raise_for_status()
-        return r.json()
-
-def retrieve_data_source_by_id(token: str, data_source_id: str) -> dict:
-    url = f"https://api.notion.com/v1/data_sources/{data_source_id}"
-    headers = {
-        "Authorization": f"Bearer {token}",
-        "Notion-Version": NOTION_VERSION,
-    }
-    with httpx.Client(timeout=30.0) as client:
-        r = client.get(url, headers=headers)
-        r.raise_for_status()
-        return r.json()
-
-def extract_data_source_title(ds: dict) -> str:
-    t = _rt_to_text(ds.get("title"))
-    if t:
-        return t
-    name = ds.get("name")
-    if isinstance(name, str) and name.strip():
-        return name.strip()
-    return ""
-
-def require_env(name: str) -> str:
-    """Require an environment variable to be set.
-
-    Args:
-        name: The name of the environment variable to retrieve.
-
-    Returns:
-        The value of the environment variable.
-
-    Raises:
-        RuntimeError: If the environment variable is not set.
-    """
-    val = os.environ.get(name)
-    if not val:
-        raise RuntimeError(f"Missing env var: {name}")
-    return val
-
-def list_all_data_sources(notion: NotionClient) -> None:
-    cursor = None
-    count = 0
-
-    while True:
-        resp = cast(Dict[str, Any], notion.search(
-            start_cursor=cursor,
-            page_size=100,
-            filter={"property": "object", "value": "data_source"},
-        ))
-
-        for item in resp.get("results", []):
-            title_parts = item.get("title") or []
-            title = "".join(p.get("plain_text", "") for p in title_parts).strip()
-            print(title)
-            count += 1
-
-        cursor = resp.get("next_cursor")
-        if not resp.get("has_more"):
-            break
-
-    print(f"\nTotal data sources visible to integration: {count}")
+    # Only the title is used, so don't download the page's other properties
+    r = _http_client(token).get(f"/pages/{page_id}", params=TITLE_ONLY_PARAMS)
+    r.raise_for_status()
+    return json_loads(r.content)
 
 def prompt_db_name_if_missing(db_name: Optional[str]) -> str:
     """Prompt the user for a Notion database name if not provided.
@@ -132,166 +125,274 @@ def prompt_db_name_if_missing(db_name: Optional[str]) -> str:
     return entered
 
 
-def find_data_source_id_by_name(notion: NotionClient, db_name: str) -> str:
+def find_data_source_id_by_name(token: str, db_name: str) -> str:
     """
     Find a Notion *data source* whose title matches db_name exactly.
     Notion Search filter supports value='data_source' (NOT 'database').
+    If db_name is a data source UUID, it is retrieved directly without searching.
     """
-    cursor = None
-    matches = []
-
-    while True:
-        resp = cast(Dict[str, Any], notion.search(
-            query=db_name,
-            start_cursor=cursor,
-            page_size=50,
-            filter={"property": "object", "value": "data_source"},
-            sort={"direction": "descending", "timestamp": "last_edited_time"},
-        ))
-
-        for item in resp.get("results", []):
-            if item.get("object") != "data_source":
-                continue
-            title = extract_data_source_title(item)
-            if title == db_name:
-                matches.append(item)
-
-        cursor = resp.get("next_cursor")
-        if not resp.get("has_more"):
-            break
-
-    if not matches:
-        raise LookupError(
-            f"No Notion data_source found with exact name '{db_name}'. "
-            f"Confirm the data source is shared with your integration and you're using the correct NOTION_TOKEN."
-        )
-
-    return matches[0]["id"]
-
-
-def extract_title_from_page(page: dict) -> str:
+    # Only an exact UUID takes the shortcut: normalize_uuid strips any non-hex
+    # characters, so a lenient check would send ordinary names to /data_sources too
+    if _STRICT_UUID_RE.fullmatch(db_name.strip()):
+        try:
+            return retrieve_data_source_by_id(token, normalize_uuid(db_name))["id"]
+        except httpx.HTTPStatusError:
+            pass  # not a data source we can see; treat it as a plain name
+
+    # Results are sorted newest-first, so the first exact match is the answer and
+    # returning here stops iter_search from fetching any further pages
+    for item in iter_search(
+        token,
+        query=db_name,
+        filter={"property": "object", "value": "data_source"},
+        sort={"direction": "descending", "timestamp": "last_edited_time"},
+    ):
+        if item.get("object") != "data_source":
+            continue
+        if _ds_title_from_obj(item) == db_name:
+            return item["id"]
+
+    raise LookupError(
+        f"No Notion data_source found with exact name '{db_name}'. "
+        f"Confirm the data source is shared with your integration and you're using the correct NOTION_TOKEN."
+    )
+
+
+def _ds_id_cache_key(token: str, db_name: str) -> str:
+    # never store the token itself, only enough of a hash to tell integrations apart
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()[:16] + ":" + db_name
+
+
+def _load_ds_id_cache() -> Dict[str, Dict[str, Any]]:
+    try:
+        cache = json_loads(DS_ID_CACHE_PATH.read_bytes())
+    except (OSError, ValueError):
+        return {}
+    # anything other than an object (hand-edited, truncated by another tool...) is ignored
+    if not isinstance(cache, dict):
+        return {}
+    return cast(Dict[str, Dict[str, Any]], cache)
+
+
+def _save_ds_id_cache(cache: Dict[str, Dict[str, Any]]) -> None:
+    DS_ID_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+    tmp = DS_ID_CACHE_PATH.with_suffix(".tmp")
+    tmp.write_bytes(json_dumps(cache))
+    os.replace(tmp, DS_ID_CACHE_PATH)
+
+
+@functools.lru_cache(maxsize=None)
+def find_data_source_id_cached(token: str, db_name: str) -> Tuple[str, bool]:
     """
-    Finds the 'title' property on the page (database row) and returns its plain text.
-    This avoids assuming the title property is literally named "Name".
+    find_data_source_id_by_name, memoized in-process and in a JSON file under
+    ~/.cache with a TTL of DS_ID_CACHE_TTL_SECONDS.
+    Returns (data_source_id, from_cache), where from_cache is True when the id was
+    read from the file rather than looked up just now.
     """
-    props = page.get("properties", {})
-    for prop in props.values():
-        if prop.get("type") == "title":
-            title_items = prop.get("title", [])
-            return "".join([t.get("plain_text", "") for t in title_items]).strip()
-    return ""
+    key = _ds_id_cache_key(token, db_name)
+    cache = _load_ds_id_cache()
+    entry = cache.get(key)
+    if (
+        isinstance(entry, dict)
+        and isinstance(entry.get("id"), str)
+        and isinstance(entry.get("ts"), (int, float))
+        and time.time() - entry["ts"] < DS_ID_CACHE_TTL_SECONDS
+    ):
+        return entry["id"], True
+
+    ds_id = find_data_source_id_by_name(token, db_name)
+    cache[key] = {"id": ds_id, "ts": time.time()}
+    try:
+        _save_ds_id_cache(cache)
+    except OSError:
+        pass  # caching is best-effort
+    return ds_id, False
 
 
-def query_data_source_pages(notion: NotionClient, data_source_id: str) -> List[Dict[str, Any]]:
+def invalidate_cached_data_source_id(token: str, db_name: str) -> None:
     """
-    Query all pages (rows) in a Notion data source with pagination.
-    Tries SDK endpoint if present, otherwise falls back to raw HTTP.
+    Forget the cached data source id for db_name, both in-process and on disk.
     """
-    results: List[Dict[str, Any]] = []
-    cursor: Optional[str] = None
-
-    # Try SDK first (newer notion-client versions may provide this)
-    data_sources_ep = getattr(notion, "data_sources", None)
-
-    while True:
-        if data_sources_ep is not None and hasattr(data_sources_ep, "query"):
-            resp = cast(Dict[str, Any], data_sources_ep.query(  # type: ignore[attr-defined]
-                data_source_id=data_source_id,
-                start_cursor=cursor,
-                page_size=100,
-            ))
-        else:
-            # Fallback: direct REST call to Query a data source
-            token = require_env("NOTION_TOKEN")
-            notion_version = "2025-09-03"
-            url = f"https://api.notion.com/v1/data_sources/{data_source_id}/query"
-
-            headers = {
-                "Authorization": f"Bearer {token}",
-                "Notion-Version": notion_version,
-                "Content-Type": "application/json",
-            }
-            payload: Dict[str, Any] = {"page_size": 100}
-            if cursor:
-                payload["start_cursor"] = cursor
-
-            with httpx.Client(timeout=30.0) as client:
-                r = client.post(url, headers=headers, json=payload)
-                r.raise_for_status()
-                resp = cast(Dict[str, Any], r.json())
-
-        results.extend(cast(List[Dict[str, Any]], resp.get("results", [])))
-
-        cursor = cast(Optional[str], resp.get("next_cursor"))
-        if not resp.get("has_more"):
-            break
-
-    return results
-
-
-def collect_row_titles_from_data_source(notion: NotionClient, data_source_id: str) -> List[str]:
-    pages = query_data_source_pages(notion, data_source_id)
-    titles: List[str] = []
-    for page in pages:
-        titles.append(extract_title_from_page(page))
-    return titles
+    find_data_source_id_cached.cache_clear()
+    cache = _load_ds_id_cache()
+    if cache.pop(_ds_id_cache_key(token, db_name), None) is not None:
+        try:
+            _save_ds_id_cache(cache)
+        except OSError:
+            pass
+
+
+def query_data_source_pages(
+    token: str,
+    data_source_id: str,
+    property_ids: Optional[List[str]] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield every page (row) in a Notion data source, following pagination.
+    Only one API page of results is held at a time.
+    If property_ids is given, only those properties are included in each page.
+
+    Uses raw HTTP on the shared client rather than notion.data_sources.query: the SDK
+    decodes every response with the stdlib json module and offers no hook to change that,
+    while this is the largest volume of JSON the tool parses.
+    """
+    # filter_properties is a query-string parameter, repeated once per property id
+    params = {"filter_properties": property_ids} if property_ids else None
+    return paginate(token, f"/data_sources/{data_source_id}/query", {"page_size": PAGE_SIZE}, params)
 
-def _page_title_from_search_obj(obj: dict) -> str:
-    # Search results often include a top-level "title" field for pages
-    t = _rt_to_text(obj.get("title"))
-    if t:
-        return t
-    # Fallback: try to derive title from properties (if present)
-    props = obj.get("properties", {}) or {}
-    for prop in props.values():
-        if prop.get("type") == "title":
-            return _rt_to_text(prop.get("title"))
-    return ""
 
-def _data_source_title_from_search_obj(obj: dict) -> str:
-    t = _rt_to_text(obj.get("title"))
-    if t:
-        return t
-    name = obj.get("name")
-    if isinstance(name, str) and name.strip():
-        return name.strip()
-    return ""
+def find_title_prop_key(page: dict) -> Optional[str]:
+    """
+    Return the key (property name) of a page's title property, or None if it has none.
+    """
+    for key, prop in page["properties"].items():
+        if prop["type"] == "title":
+            return key
+    return None
+
+
+def collect_row_titles_from_data_source(token: str, data_source_id: str) -> List[str]:
+    # Ask for just the title property (its id is always "title"). Every row of a data
+    # source shares one schema, so the title's key is found once on the first row and
+    # then read directly; titles are extracted as pages stream in.
+    pages = query_data_source_pages(token, data_source_id, [TITLE_PROPERTY_ID])
+    first = next(pages, None)
+    if first is None:
+        return []
+
+    title_key = find_title_prop_key(first)
+    if title_key is None:
+        # Unexpected schema: fall back to full pages and scan each one
+        return [extract_page_title(page) for page in query_data_source_pages(token, data_source_id)]
+
+    titles = [extract_page_title(first, title_key)]
+    titles.extend(extract_page_title(page, title_key) for page in pages)
+    return titles
 
+def _visible_object_line(item: dict, object_type: str, fetched_titles: Dict[str, str]) -> str:
+    oid = item.get("id", "")
+    if object_type == "page":
+        title = extract_page_title(item) or "(no title returned)"
+        return f"{oid} | PAGE | {title}"
+    title = _ds_title_from_obj(item) or fetched_titles.get(oid) or "(no title returned)"
+    return f"{oid} | DATA_SOURCE | {title}"
 
-def list_visible_objects(notion: NotionClient, object_type: str) -> None:
+
+def list_visible_objects(token: str, object_type: str) -> None:
     """
     object_type: 'page' or 'data_source'
     """
-    cursor = None
-    count = 0
-    while True:
-        resp = cast(Dict[str, Any], notion.search(
-            start_cursor=cursor,
-            page_size=100,
-            filter={"property": "object", "value": object_type},
-        ))
-
-        for item in resp.get("results", []):
-            oid = item.get("id", "")
-            if object_type == "page":
-                title = _page_title_from_search_obj(item) or "(no title returned)"
-                print(f"{oid} | PAGE | {title}")
-            else:
-                title = _data_source_title_from_search_obj(item) or "(no title returned)"
-                print(f"{oid} | DATA_SOURCE | {title}")
-            count += 1
-
-        cursor = cast(Optional[str], resp.get("next_cursor"))
-        if not resp.get("has_more"):
-            break
+    items = list(iter_search(token, filter={"property": "object", "value": object_type}))
+    # Data sources search returned without a title are looked up concurrently afterwards
+    fetched_titles = fetch_missing_data_source_titles(token, items) if object_type == "data_source" else {}
+
+    count = write_lines(_visible_object_line(item, object_type, fetched_titles) for item in items)
 
     print(f"\nTotal {object_type}s visible to integration: {count}")
 
 
+async def _search_objects_async(token: str, object_type: str) -> List[Dict[str, Any]]:
+    """
+    Collect every search result of one object type. Cursor pagination is
+    sequential, so concurrency comes from running several of these at once,
+    each walking iter_search in a worker thread.
+    """
+    return await asyncio.to_thread(list, iter_search(token, filter={"property": "object", "value": object_type}))
+
+
+async def list_all_objects_async(token: str) -> None:
+    """
+    List all visible data sources and pages, fetching both listings concurrently.
+    Output order matches running the two listings one after the other.
+    """
+    _http_client(token)  # create the shared client up front rather than racing for it in two threads
+    data_sources, pages = await asyncio.gather(
+        _search_objects_async(token, "data_source"),
+        _search_objects_async(token, "page"),
+    )
+    fetched_titles: Dict[str, str] = {}
+    missing = ids_missing_titles(data_sources)
+    if missing:
+        async with _async_client(token) as client:
+            fetched_titles = await fetch_missing_data_source_titles_async(client, missing)
+
+    for object_type, items in (("data_source", data_sources), ("page", pages)):
+        write_lines(_visible_object_line(item, object_type, fetched_titles) for item in items)
+        print(f"\nTotal {object_type}s visible to integration: {len(items)}")
+        if object_type == "data_source":
+            print("")  # spacer
+
+
+def list_all_objects(token: str) -> None:
+    asyncio.run(list_all_objects_async(token))
+
+
+async def resolve_ids_async(token: str, obj_type: str, obj_ids: List[str]) -> List[Tuple[str, str]]:
+    """
+    Resolve many page/data_source IDs to their titles concurrently.
+    Returns (id, title) pairs in input order; failed lookups get a placeholder title.
+    """
+    endpoint = "pages" if obj_type == "page" else "data_sources"
+    extract = extract_page_title if obj_type == "page" else _ds_title_from_obj
+    params = TITLE_ONLY_PARAMS if obj_type == "page" else None
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+
+    async with _async_client(token) as client:
+        async def resolve(obj_id: str) -> str:
+            try:
+                async with semaphore:
+                    r = await get_with_retry_async(client, f"/{endpoint}/{obj_id}", params=params)
+            except httpx.HTTPError as e:
+                return f"(lookup failed: {type(e).__name__})"
+            if r.is_error:
+                return f"(lookup failed: HTTP {r.status_code})"
+            return extract(json_loads(r.content)) or "(no title returned)"
+
+        titles = await asyncio.gather(*(resolve(obj_id) for obj_id in obj_ids))
+
+    return list(zip(obj_ids, titles))
+
+
+def resolve_ids(token: str, obj_type: str, obj_ids: List[str]) -> List[Tuple[str, str]]:
+    return asyncio.run(resolve_ids_async(token, obj_type, obj_ids))
+
+
+def _run_resolve_ids_file(token: str, obj_type: str, path: str) -> None:
+    """
+    Resolve every UUID listed in path (one per line) and print 'id | TYPE | title' lines.
+    """
+    with open(path, encoding="utf-8") as f:
+        obj_ids = [normalize_uuid(line) for line in f if line.strip()]
+
+    label = obj_type.upper()
+    write_lines(f"{obj_id} | {label} | {title}" for obj_id, title in resolve_ids(token, obj_type, obj_ids))
+    print(f"\nResolved {len(obj_ids)} {obj_type} IDs")
+
+
+def _collect_row_titles_by_name(token: str, db_name: str, use_cache: bool) -> List[str]:
+    """
+    Look up the data source named db_name and return its row titles.
+    A cached id that now 404s is dropped and looked up again once.
+    """
+    if not use_cache:
+        invalidate_cached_data_source_id(token, db_name)
+
+    data_source_id, from_cache = find_data_source_id_cached(token, db_name)
+    try:
+        return collect_row_titles_from_data_source(token, data_source_id)
+    except httpx.HTTPStatusError as e:
+        if e.response.status_code != 404 or not from_cache:
+            raise
+    # the cached id went stale (deleted or no longer shared); look the name up again
+    invalidate_cached_data_source_id(token, db_name)
+    data_source_id, _ = find_data_source_id_cached(token, db_name)
+    return collect_row_titles_from_data_source(token, data_source_id)
+
+
 def main() -> None:
     """Main entry point for the module.
 
-    Parses command-line arguments, initializes the Notion API client,
+    Parses command-line arguments, reads the Notion token from the environment,
     prompts for a database name if needed, and collects and prints the row titles.
     """
     parser = argparse.ArgumentParser(description="List Notion database record names (row titles).")
@@ -301,44 +402,44 @@ def main() -> None:
     parser.add_argument("--list-pages", action="store_true", help="List all visible pages and exit.")
     parser.add_argument("--list-all", action="store_true", help="List all visible pages + data sources and exit.")
     parser.add_argument("--resolve-id", help="Resolve a Notion UUID (page or data_source) to its title/name.")
-    parser.add_argument("--type", choices=["page", "data_source"], help="Type for --resolve-id.")
+    parser.add_argument("--resolve-ids-file", help="File of Notion UUIDs (one per line) to resolve concurrently.")
+    parser.add_argument("--type", choices=["page", "data_source"], help="Type for --resolve-id / --resolve-ids-file.")
     parser.add_argument("--expect", help="Expected title/name to compare against (exact match).")
+    parser.add_argument("--no-cache", action="store_true", help="Ignore the cached name -> data source id lookup.")
     args = parser.parse_args()
 
     notion_token = require_env("NOTION_TOKEN")
-    notion = NotionClient(auth=notion_token, notion_version="2025-09-03")
-
-    if args.list_data_sources:
-        list_all_data_sources(notion)
-        return
 
     if args.list_all:
-        list_visible_objects(notion, "data_source")
-        print("")  # spacer
-        list_visible_objects(notion, "page")
+        list_all_objects(notion_token)
         return
-    
+
     if args.list_data_sources:
-        list_visible_objects(notion, "data_source")
+        list_visible_objects(notion_token, "data_source")
         return
-    
+
     if args.list_pages:
-        list_visible_objects(notion, "page")
+        list_visible_objects(notion_token, "page")
+        return
+
+    if args.resolve_ids_file:
+        if not args.type:
+            raise ValueError("--type is required when using --resolve-ids-file (page|data_source)")
+        _run_resolve_ids_file(notion_token, args.type, args.resolve_ids_file)
         return
 
     if args.resolve_id:
-        token = require_env("NOTION_TOKEN")
         obj_id = normalize_uuid(args.resolve_id)
         obj_type = args.type
         if not obj_type:
             raise ValueError("--type is required when using --resolve-id (page|data_source)")
 
         if obj_type == "page":
-            obj = retrieve_page_by_id(token, obj_id)
+            obj = retrieve_page_by_id(notion_token, obj_id)
             title = extract_page_title(obj)
         else:
-            obj = retrieve_data_source_by_id(token, obj_id)
-            title = extract_data_source_title(obj)
+            obj = retrieve_data_source_by_id(notion_token, obj_id)
+            title = _ds_title_from_obj(obj)
 
         print(f"Type: {obj_type}")
         print(f"ID:   {obj_id}")
@@ -354,22 +455,18 @@ def main() -> None:
         return
 
     db_name = prompt_db_name_if_missing(args.db_name)
-
-    data_source_id = find_data_source_id_by_name(notion, db_name)
-    titles = collect_row_titles_from_data_source(notion, data_source_id)
+    titles = _collect_row_titles_by_name(notion_token, db_name, use_cache=not args.no_cache)
 
     print(f"Database: {db_name}")
     print(f"Total records: {len(titles)}")
 
     if args.print:
-        for t in titles:
-            print(t)
-        # Always print count
-    
+        write_lines(titles)
+
 
 if __name__ == "__main__":
     try:
         main()
-    except (RuntimeError, ValueError, LookupError, KeyboardInterrupt) as e:
+    except (RuntimeError, ValueError, LookupError, OSError, KeyboardInterrupt) as e:
         print(f"ERROR: {e}", file=sys.stderr)
         sys.exit(1)
@@ -6,16 +6,33 @@ for Evernote authentication, obtaining and storing access tokens for API usage.
 import os
 import json
 from pathlib import Path
+from typing import Dict
 
 from flask import Flask, redirect, request
+from requests.adapters import HTTPAdapter
 from requests_oauthlib import OAuth1Session
 
+try:
+    # Faster JSON codec; falls back to the stdlib json module when not installed
+    import orjson
+except ImportError:
+    orjson = None
+
 # Evernote OAuth endpoints (production)
 REQUEST_TOKEN_URL = "https://www.evernote.com/oauth/request_token"
 AUTHORIZE_URL     = "https://www.evernote.com/OAuth.action"
 ACCESS_TOKEN_URL  = "https://www.evernote.com/oauth/access_token"
 
 TOKEN_PATH = Path.home() / ".config" / "evernote-notion-compare" / "evernote_token.json"
+# Created once at startup so the OAuth handlers only do the network calls and the final write
+TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+
+# Request token -> request token secret, held between "/" and "/callback" (single local process)
+_PENDING_REQUEST_TOKENS: Dict[str, str] = {}
+
+# One adapter (and so one urllib3 connection pool) mounted on every OAuth1Session, so the
+# access-token call in /callback reuses the keep-alive TLS connection opened by /
+_EVERNOTE_ADAPTER = HTTPAdapter()
 
 app = Flask(__name__)
 
@@ -36,6 +53,20 @@ def require_env(name: str) -> str:
         raise RuntimeError(f"Missing env var: {name}")
     return val
 
+def write_json(path: Path, data: dict) -> None:
+    """Atomically write data to path as indented JSON, using orjson when available.
+
+    The JSON is written to a temporary file next to path and moved into place with
+    os.replace, so readers never see a partially written file.
+    """
+    if orjson is not None:
+        payload = orjson.dumps(data, option=orjson.OPT_INDENT_2)
+    else:
+        payload = json.dumps(data, indent=2).encode("utf-8")
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_bytes(payload)
+    os.replace(tmp, path)
+
 def oauth_session(resource_owner_key=None, resource_owner_secret=None) -> OAuth1Session:
     """Create an OAuth1Session for Evernote authentication.
 
@@ -44,18 +75,21 @@ def oauth_session(resource_owner_key=None, resource_owner_secret=None) -> OAuth1
         resource_owner_secret: Optional OAuth request token secret.
 
     Returns:
-        An OAuth1Session configured with Evernote credentials from environment variables.
+        An OAuth1Session configured with Evernote credentials from environment variables,
+        sharing its HTTPS connection pool with every other session created here.
 
     Raises:
         RuntimeError: If required environment variables are not set.
     """
-    return OAuth1Session(
+    sess = OAuth1Session(
         client_key=require_env("EVERNOTE_CONSUMER_KEY"),
         client_secret=require_env("EVERNOTE_CONSUMER_SECRET"),
         callback_uri=require_env("EVERNOTE_CALLBACK_URL"),
         resource_owner_key=resource_owner_key,
         resource_owner_secret=resource_owner_secret,
     )
+    sess.mount("https://", _EVERNOTE_ADAPTER)
+    return sess
 
 @app.get("/")
 def start():
@@ -71,20 +105,13 @@ def start():
     sess = oauth_session()
     fetch = sess.fetch_request_token(REQUEST_TOKEN_URL)
 
-    # Save request token temporarily (in-memory via query params or server state is also OK for local dev)
+    # Keep the request token secret in memory for the callback step (this is a single local process)
     oauth_token = fetch["oauth_token"]
-    oauth_token_secret = fetch["oauth_token_secret"]
+    _PENDING_REQUEST_TOKENS[oauth_token] = fetch["oauth_token_secret"]
 
     # 2) Redirect user to Evernote to authorize
     auth_url = sess.authorization_url(AUTHORIZE_URL, oauth_token=oauth_token)
 
-    # Stash request token/secret in a local file for the callback step (simple + fine for local dev)
-    TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
-    TOKEN_PATH.write_text(json.dumps({
-        "request_oauth_token": oauth_token,
-        "request_oauth_token_secret": oauth_token_secret
-    }, indent=2))
-
     return redirect(auth_url)
 
 @app.get("/callback")
@@ -97,16 +124,16 @@ def callback():
     Returns:
         A success message indicating the OAuth flow is complete.
     """
-    # Read saved request token/secret
-    data = json.loads(TOKEN_PATH.read_text())
-    req_token = data["request_oauth_token"]
-    req_secret = data["request_oauth_token_secret"]
-
-    # 3) Evernote returns oauth_verifier
+    # 3) Evernote returns the request token it authorized plus an oauth_verifier
     oauth_verifier = request.args.get("oauth_verifier")
     if not oauth_verifier:
         return "Missing oauth_verifier in callback.", 400
 
+    req_token = request.args.get("oauth_token", "")
+    req_secret = _PENDING_REQUEST_TOKENS.pop(req_token, None)
+    if req_secret is None:
+        return "Unknown or already used oauth_token in callback; start again at /.", 400
+
     # 4) Exchange request token for an access token
     sess = oauth_session(resource_owner_key=req_token, resource_owner_secret=req_secret)
     token = sess.fetch_access_token(ACCESS_TOKEN_URL, verifier=oauth_verifier)
@@ -115,10 +142,10 @@ def callback():
     access_token_secret = token.get("oauth_token_secret")  # sometimes present; keep it
 
     # Persist access token for later scripts
-    TOKEN_PATH.write_text(json.dumps({
+    write_json(TOKEN_PATH, {
         "access_token": access_token,
         "access_token_secret": access_token_secret
-    }, indent=2))
+    })
 
     return (
         "Evernote OAuth complete. Token saved to:\n"